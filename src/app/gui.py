@@ -11,9 +11,10 @@ Run:
     python -m src.app.gui
 """
 from __future__ import annotations
+import concurrent.futures
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
-from typing import Optional
+from typing import Optional, Tuple
 import numpy as np
 from PIL import Image, ImageTk
 
@@ -23,6 +24,8 @@ WINDOW_TITLE = "X-ray Simulator (Minimal)"
 DEFAULT_MA = 200.0
 DEFAULT_KVP = 70.0
 IMG_SIZE = (256, 256)
+PREVIEW_SIZE = (64, 64)   # coarse render while a slider is being dragged
+FULL_RES_DELAY_MS = 200   # full-resolution render once the slider rests this long
 
 class XRayApp(tk.Tk):
     def __init__(self) -> None:
@@ -33,10 +36,24 @@ class XRayApp(tk.Tk):
         self.var_mA = tk.DoubleVar(value=DEFAULT_MA)
         self.var_kVp = tk.DoubleVar(value=DEFAULT_KVP)
 
-        # Debounce handle for slider drags
+        # Pending full-resolution render after slider drags
         self._after_id: Optional[str] = None
 
-        # Last rendered PIL image / Tk image
+        # (mA, kVp) and size of the image currently shown; used to skip identical re-renders
+        self._last_params: Optional[Tuple[int, int]] = None
+        self._last_size: Tuple[int, int] = (0, 0)
+
+        # Render buffers per size (float32, uint8), reused to avoid per-frame allocations
+        self._bufs = {size: (np.empty(size, dtype=np.float32), np.empty(size, dtype=np.uint8))
+                      for size in (IMG_SIZE, PREVIEW_SIZE)}
+
+        # Background render worker (single thread: renders never overlap on the buffers)
+        self._pool = concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix="render")
+        self._future: Optional[concurrent.futures.Future] = None
+        self._poll_id: Optional[str] = None
+        self._render_pending: Optional[Tuple[int, int]] = None  # size of the queued render
+
+        # Last full-resolution PIL image (for saving) / displayed Tk image
         self._last_pil: Optional[Image.Image] = None
         self._last_tk: Optional[ImageTk.PhotoImage] = None
 
@@ -73,16 +90,32 @@ class XRayApp(tk.Tk):
         self.status = ttk.Label(self, anchor="w", relief="sunken")
         self.status.pack(fill="x", side="bottom")
 
+        self.protocol("WM_DELETE_WINDOW", self._on_close)
+
         # Initial render
         self.render()
     
     # --- Event handlers ---
     def _on_slider(self, _evt=None) -> None:
-        """Debounce heavy re-rendering while the user is dragging."""
+        """Progressive render: coarse preview while dragging, full resolution once it rests."""
         if self._after_id:
             self.after_cancel(self._after_id)
-        self._after_id = self.after(80, self.render) # ~80ms debounce
+        self.render(size=PREVIEW_SIZE)
+        self._after_id = self.after(FULL_RES_DELAY_MS, self._render_full)
+
+    def _render_full(self) -> None:
+        """Scheduled full-resolution render after the slider comes to rest."""
+        self._after_id = None
+        self.render()
         
+    def _on_close(self) -> None:
+        """Stop pending callbacks and the render worker, then close the window."""
+        for handle in (self._after_id, self._poll_id):
+            if handle:
+                self.after_cancel(handle)
+        self._pool.shutdown(wait=True)
+        self.destroy()
+
     def reset_params(self) -> None:
         """Reset sliders to default values and re-render."""
         self.var_mA.set(DEFAULT_MA)
@@ -101,30 +134,79 @@ class XRayApp(tk.Tk):
             title="Save current image",
         )
         if path:
+            self._finish_render()
             self._last_pil.save(path)
             messagebox.showinfo("Saved", f"Saved: {path}")
     
     # --- Render pipeline ---
-    def render(self) -> None:
-        """Call simulator and update the preview."""
-        self._after_id = None
+    def render(self, size: Tuple[int, int] = IMG_SIZE) -> None:
+        """Start a background render of the given size for the current slider values."""
+        # Only one render in flight; pick up the latest values once it lands
+        if self._future is not None:
+            self._render_pending = size
+            return
 
         mA = float(self.var_mA.get())
         kVp = float(self.var_kVp.get())
 
-        arr = simulate(mA=mA, kVp=kVp, size=IMG_SIZE)
-        arr = np.clip(arr, 0.0, 1.0)
+        # Scales move in whole units; for unchanged quantized params only ever
+        # re-render upward in resolution (never replace a full frame by a preview)
+        params = (int(round(mA)), int(round(kVp)))
+        if params == self._last_params and size[0] * size[1] <= self._last_size[0] * self._last_size[1]:
+            return
+        self._last_params = params
+        self._last_size = size
+
+        self._future = self._pool.submit(self._compute, *params, size)
+        self._poll_id = self.after(5, self._poll_render)
+
+    def _compute(self, mA: int, kVp: int, size: Tuple[int, int]) -> Tuple[int, int, Tuple[int, int]]:
+        """Worker thread: simulate and convert to 8-bit into the buffers for `size`."""
+        buf_f, buf_u8 = self._bufs[size]
+        # simulate() guarantees values in [0, 1]; no extra clamp needed here
+        arr = simulate(mA=mA, kVp=kVp, size=size, out=buf_f)
+        np.multiply(arr, 255, out=buf_u8, casting="unsafe")
+        return mA, kVp, size
+
+    def _poll_render(self) -> None:
+        """Main thread: wait for the worker without blocking the event loop."""
+        if not self._future.done():
+            self._poll_id = self.after(5, self._poll_render)
+            return
+        self._poll_id = None
+        future, self._future = self._future, None
+        self._apply_result(*future.result())
 
-        # Convert to 8-bit grayscale PIL image
-        img = Image.fromarray((arr * 255).astype(np.uint8), mode="L")
-        self._last_pil = img
+        if self._render_pending is not None:
+            size, self._render_pending = self._render_pending, None
+            self.render(size=size)
+
+    def _finish_render(self) -> None:
+        """Block until the latest full-resolution frame is shown (e.g. before saving)."""
+        if self._after_id:
+            self.after_cancel(self._after_id)
+            self._render_full()
+        while self._future is not None:
+            concurrent.futures.wait([self._future])
+            self.after_cancel(self._poll_id)
+            self._poll_render()
+
+    def _apply_result(self, mA: int, kVp: int, size: Tuple[int, int]) -> None:
+        """Main thread: update the preview from the filled uint8 buffer."""
+        h, w = size
+        # Share memory with the C-contiguous uint8 buffer instead of copying it
+        img = Image.frombuffer("L", (w, h), memoryview(self._bufs[size][1]), "raw", "L", 0, 1)
+        if size == IMG_SIZE:
+            self._last_pil = img
+        else:
+            # Coarse preview: blow up to the full display size with blocky pixels
+            img = img.resize((IMG_SIZE[1], IMG_SIZE[0]), Image.NEAREST)
 
         # Keep a reference to avoid garbage collection
         self._last_tk = ImageTk.PhotoImage(img)
         self.preview.configure(image=self._last_tk)
 
         # Update status bar
-        h, w = IMG_SIZE
         self.status.configure(text=f"mA: {mA:.0f} kVp:{kVp:.0f} Size: {w}x{h}")
 
 def main() -> None:
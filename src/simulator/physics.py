@@ -16,6 +16,7 @@ This is a *didactic* model:
 - No scatter, heel effect, detector MTF/NRF, or noise (to be added later).
 """
 from __future__ import annotations
+from functools import lru_cache
 from typing import Tuple, Optional
 import numpy as np
 
@@ -44,6 +45,7 @@ def _normalize(v: float, lo: float, hi: float) -> float:
         return 0.0
     return float(np.clip((v - lo) / (hi - lo), 0.0, 1.0))
 
+@lru_cache(maxsize=4)
 def _sphere_thickness_map(size: Tuple[int, int],
                           fov_x_cm: float,
                           radius_cm: float,
@@ -54,36 +56,90 @@ def _sphere_thickness_map(size: Tuple[int, int],
     
     FOV is defined along X: width = fov_x_cm.
     Pixel size [cm/px] = fov_x_cm / W. Y-range is derived to keep square pixels.
+
+    The geometry does not change between renders, so results are memoized
+    (all args must be hashable, i.e. tuples). The returned array is shared
+    across calls and therefore read-only.
     """
     H, W = int(size[0]), int(size[1])
     assert H > 0 and W > 0
 
     px_cm = fov_x_cm / float(W)
-    fov_y_cm = px_cm * H
-
-    # Build physical coordinate grid (centered)
-    x = (np.linspace(0, W - 1, W, dtype=np.float32) - (W - 1) / 2.0) * px_cm
-    y = (np.linspace(0, H - 1, H, dtype=np.float32) - (H - 1) / 2.0) * px_cm
-    yy, xx = np.meshgrid(y, x, indexing="ij")
-
-    # Shift by sphere center (cx, cy)
+    # Physical coordinates along each axis (centered), shifted by sphere center (cx, cy).
+    # The radial term is separable: r^2 = dx^2 + dy^2, so only 1D arrays are needed.
     cx, cy = center_cm
-    dx = xx -cx
-    dy = yy - cy
-    r = np.sqrt(dx**2 + dy**2)
+    dx = (np.arange(W, dtype=np.float32) - (W - 1) / 2.0) * px_cm - cx
+    dy = (np.arange(H, dtype=np.float32) - (H - 1) / 2.0) * px_cm - cy
+    dx2 = np.square(dx, dtype=np.float32)
+    dy2 = np.square(dy, dtype=np.float32)
 
     # Thickness through a sphere at radial distance r: 2 * sqrt(R^2 - r^2), else 0
     R = float(radius_cm)
-    inside = r <= R
-    t = np.zeros((H, W), dtype=np.float32)
-    # Avoid negative due to float roundoff
-    t[inside] = 2.0 * np.sqrt(np.maximum(0.0, R**2 - r[inside]**2)).astype(np.float32)
+    t = np.empty((H, W), dtype=np.float32)
+    np.subtract((R * R - dy2)[:, None], dx2[None, :], out=t)
+    # Outside the sphere (and negative float roundoff) -> 0
+    np.maximum(t, 0.0, out=t)
+    np.sqrt(t, out=t)
+    np.multiply(t, 2.0, out=t)
+    t.setflags(write=False)
     return t # [cm]
 
+def _beer_lambert(t: np.ndarray, mu: float, I0: float, out: np.ndarray) -> np.ndarray:
+    """
+    Clamped Beer-Lambert law I = clip(I0 * exp(-mu * t), 0, 1), evaluated in place
+    in a preallocated float32 (H, W) buffer `out` (must not alias t).
+    float32 scalars keep every pass in float32, so no (H, W) temporaries are made.
+    """
+    np.multiply(t, np.float32(-mu), out=out)
+    np.exp(out, out=out)
+    np.multiply(out, np.float32(I0), out=out)
+    np.clip(out, 0.0, 1.0, out=out)
+    return out
+
+def _mu_formula(kVp: float) -> float:
+    """
+    Effective attenuation mu(kVp) [1/cm] (simple power-law falloff with energy).
+    """
+    kVp_eff = float(max(10.0, kVp)) # guard against zero/neq
+    mu = MU_REF_CM1 * (KVP_REF / kVp_eff) ** MU_POWER
+    return float(max(MU_MIN, mu))  # floor to avoid vanish
+
+def _i0_formula(mA: float) -> float:
+    """
+    Incident intensity I0 from mA (linear ramp).
+    """
+    n_mA = _normalize(mA, 10.0, 500.0)
+    return I0_MIN + (I0_MAX - I0_MIN) * n_mA
+
+# Lookup tables for whole-number settings (the GUI scales use resolution=1),
+# built from the formulas above so both paths always agree.
+_MU_BY_KVP = np.array([_mu_formula(k) for k in range(201)], dtype=np.float32)
+_I0_BY_MA = np.array([_i0_formula(m) for m in range(1001)], dtype=np.float32)
+
+def _effective_mu(kVp: float) -> float:
+    """
+    mu(kVp) [1/cm]: table lookup for whole-number kVp in range, else the formula.
+    """
+    kVp = float(kVp)
+    # is_integer() is False for nan/inf, which fall through to the formula
+    if kVp.is_integer() and 0 <= kVp < _MU_BY_KVP.size:
+        return float(_MU_BY_KVP[int(kVp)])
+    return _mu_formula(kVp)
+
+def _incident_intensity(mA: float) -> float:
+    """
+    I0(mA): table lookup for whole-number mA in range, else the formula.
+    """
+    mA = float(mA)
+    if mA.is_integer() and 0 <= mA < _I0_BY_MA.size:
+        return float(_I0_BY_MA[int(mA)])
+    return _i0_formula(mA)
+
 def simulate(mA: float, 
              kVp: float, 
              size: Tuple[int, int] = (256, 256), 
-             seed: Optional[int] = None) -> np.ndarray:
+             seed: Optional[int] = None,
+             out: Optional[np.ndarray] = None) -> np.ndarray:
     """
     Compute a Beer-Lambert projection of a single material spherical phantom.
     
@@ -92,30 +148,29 @@ def simulate(mA: float,
         kVp: Tube voltage [kVp], e.g., 40..120. Controls effective mu (attenuation).
         size: (H, W) of the output array.
         seed: Unused here (reserved for future stochastic effects).
+        out: Optional preallocated float32 C-contiguous (H, W) buffer to write into.
     
     Returns:
         float32 image (H, W) in [0, 1], where 0=black (strong absorption), 1=white (air-like).
+        This is `out` when provided.
     """
     H, W = int(size[0]), int(size[1])
+    if out is None:
+        out = np.empty((H, W), dtype=np.float32)
+    elif out.shape != (H, W) or out.dtype != np.float32 or not out.flags["C_CONTIGUOUS"]:
+        raise ValueError(f"out must be a C-contiguous float32 array of shape {(H, W)}")
 
-    # 1) Thickness map [cm]
-    t_cm = _sphere_thickness_map(size=(H, W),
-                                 fov_x_cm=FOV_X_CM,
-                                 radius_cm=SPHERE_RADIUS_CM,
-                                 center_cm=SPHERE_CENTER_CM)  # [cm]
-    
-    # 2) Effective attenuation mu(kVp) [1/cm] (simple power-law falloff with energy)
-    kVp_eff = float(max(10.0, kVp)) # guard against zero/neq
-    mu = MU_REF_CM1 * (KVP_REF / kVp_eff) ** MU_POWER
-    mu = float(max(MU_MIN, mu))  # floor to avoid vanish
+    # 1) Effective attenuation mu(kVp) [1/cm]
+    mu = _effective_mu(kVp)
 
-    # 3) Incident intensity I0 from mA (linear ramp)
-    n_mA = _normalize(mA, 10.0, 500.0)
-    I0 = I0_MIN + (I0_MAX - I0_MIN) * n_mA
+    # 2) Incident intensity I0 from mA
+    I0 = _incident_intensity(mA)
 
-    # 4) Beer-Lambert: I = I0 * exp(-mu * t)
-    I = I0 * np.exp(-mu * t_cm, dtype=np.float32)
+    # 3) Thickness map [cm] (cached; read-only)
+    t_cm = _sphere_thickness_map(size=(H, W),
+                                 fov_x_cm=float(FOV_X_CM),
+                                 radius_cm=float(SPHERE_RADIUS_CM),
+                                 center_cm=tuple(SPHERE_CENTER_CM))  # [cm]
 
-    # 5) Display clamp to [0,1]
-    I = np.clip(I, 0.0, 1.0).astype(np.float32)
-    return I
\ No newline at end of file
+    # 4) Beer-Lambert: I = I0 * exp(-mu * t), clamped to [0,1] for display
+    return _beer_lambert(t_cm, mu, I0, out=out)